@@ -0,0 +1,146 @@
+""" Benchmark the per-shot cost of club and session enrichment during ingest
+
+Without --conf only the in-process work is timed: parsing, the bag lookup and
+the session decision. With --conf pointing at a config for a scratch PostgreSQL
+database, insert_shot is also timed with and without the session write.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+# pylint: disable=wrong-import-position
+from db.gspro_database import GSProDatabaseHandler
+from db.session_tracker import SessionTracker, parse_shot_time
+
+CLUBS = ['DR', 'W3', 'H4', 'I5', 'I6', 'I7', 'I8', 'I9', 'PW', 'GW', 'SW', 'LW']
+
+def build_gspro_db(path, shots):
+    """ Create a GSPro-like database with a player bag and the given number of shots """
+    bag = [{'ClubIndex': i, 'Club': code, 'ClubName': code, 'Loft': 10.5 + 4 * i}
+           for i, code in enumerate(CLUBS)]
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("CREATE TABLE PlayerBag (UserGuid TEXT, Clubs TEXT)")
+        conn.execute("CREATE TABLE DrivingRangeShot (ID INTEGER PRIMARY KEY, DateCreated TEXT, ShotData TEXT)")
+        conn.execute("INSERT INTO PlayerBag VALUES (?, ?)", ('player', json.dumps(bag)))
+        start = datetime(2025, 1, 17, 17, 0)
+        rows = []
+        for i in range(shots):
+            # Leave a long break every 100 shots so new sessions get opened
+            shot_time = start + timedelta(seconds=40 * i, hours=2 * (i // 100))
+            shot = {'club': CLUBS[i % len(CLUBS)], 'BallSpeed': 120.0, 'BackSpin': 5000,
+                    'SideSpin': -300, 'HLA': 1.2, 'VLA': 14.0, 'Carry': 180.0}
+            rows.append((i + 1, shot_time.isoformat(sep=' '), json.dumps(shot)))
+        conn.executemany("INSERT INTO DrivingRangeShot VALUES (?, ?, ?)", rows)
+    conn.close()
+
+def run_baseline(handler, raw_shots):
+    """ Parse shots the way ingest did before enrichment """
+    for shot_id, date_created, shot_data_str in raw_shots:
+        processed_data = handler.process_shot_data(shot_data_str)
+        processed_data['gspro_shot_id'] = shot_id
+        processed_data['gspro_date_created'] = date_created
+
+def run_enriched(handler, raw_shots, tracker):
+    """ Parse shots and add the cached club lookup and session assignment """
+    club_lookup = handler.get_club_lookup()
+    next_session_id = 0
+    for shot_id, date_created, shot_data_str in raw_shots:
+        processed_data = handler.process_shot_data(shot_data_str)
+        processed_data['gspro_shot_id'] = shot_id
+        processed_data['gspro_date_created'] = date_created
+        handler.enrich_shot(processed_data, club_lookup)
+        shot_time = parse_shot_time(date_created)
+        if tracker.starts_new_session(shot_time):
+            next_session_id += 1
+        tracker.advance(next_session_id, shot_time)
+    return next_session_id
+
+def run_uncached(handler, raw_shots):
+    """ Parse shots and re-read the bag for every shot (synthetic worst case, not a past behaviour) """
+    for shot_id, date_created, shot_data_str in raw_shots:
+        processed_data = handler.process_shot_data(shot_data_str)
+        processed_data['gspro_shot_id'] = shot_id
+        processed_data['gspro_date_created'] = date_created
+        handler.bag_cache.clear()
+        handler.get_player_clubs()
+
+def run_postgres(conf, handler, raw_shots):
+    """ Time insert_shot with and without session tracking, returning both elapsed times """
+    # pylint: disable=import-outside-toplevel
+    import yaml
+    from db.shot_database import ShotDatabase
+
+    with open(conf, 'r', encoding='utf-8') as file:
+        settings = yaml.safe_load(file)
+    plain_db = ShotDatabase(dict(settings, track_sessions=False))
+    db = ShotDatabase(dict(settings, track_sessions=True))
+    db.create_session_tables()
+    db.cursor.execute("SELECT COALESCE(MAX(gspro_shot_id), 0) FROM {}".format(db.table))
+    first_id = db.cursor.fetchone()[0] + 1
+    db.connection.commit()
+
+    club_lookup = handler.get_club_lookup()
+    shots = []
+    for offset, (_, date_created, shot_data_str) in enumerate(raw_shots):
+        processed_data = handler.process_shot_data(shot_data_str)
+        processed_data['gspro_shot_id'] = first_id + offset
+        processed_data['gspro_date_created'] = date_created
+        shots.append(handler.enrich_shot(processed_data, club_lookup))
+
+    def insert(target, batch):
+        for shot in batch:
+            target.insert_shot(shot)
+
+    half = len(shots) // 2
+    plain, _ = timed('insert_shot', half, insert, plain_db, shots[:half])
+    tracked, _ = timed('insert_shot + session', len(shots) - half, insert, db, shots[half:])
+    plain_db.connection.close()
+    db.connection.close()
+    return plain / half, tracked / (len(shots) - half)
+
+def timed(label, shots, func, *args):
+    """ Run func and print the per-shot time in microseconds """
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed * 1e6 / shots:8.2f} us/shot")
+    return elapsed, result
+
+def main():
+    """ Run the benchmark """
+    parser = argparse.ArgumentParser(description="Enrichment benchmark")
+    parser.add_argument('--shots', type=int, default=20000, help='Number of shots to ingest.')
+    parser.add_argument('--conf', type=str, required=False,
+                        help='Config for a scratch PostgreSQL database; benchmark shots are written to it.')
+    args = parser.parse_args()
+    if args.conf and args.shots < 2:
+        parser.error('--conf needs at least 2 shots, half are stored without sessions')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'GSPro.db')
+        build_gspro_db(db_path, args.shots)
+        handler = GSProDatabaseHandler({'gspro_db_path': db_path})
+        raw_shots = handler.get_new_shots()
+
+        baseline, _ = timed('parse only', args.shots, run_baseline, handler, raw_shots)
+        enriched, sessions = timed('parse + enrichment', args.shots, run_enriched,
+                                   handler, raw_shots, SessionTracker())
+        timed('parse + bag per shot', args.shots, run_uncached, handler, raw_shots)
+        if args.conf:
+            plain, tracked = run_postgres(args.conf, handler, raw_shots)
+
+    overhead = (enriched - baseline) * 1e6 / args.shots
+    print(f"enrichment overhead    {overhead:8.2f} us/shot ({sessions} sessions, excluding DB writes)")
+    if args.conf:
+        print(f"session write overhead {(tracked - plain) * 1e6:8.2f} us/shot")
+
+if __name__ == "__main__":
+    main()
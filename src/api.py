@@ -14,7 +14,10 @@ def create_app(db,db_type):
             payload = ''
             code = 204
             pragma = 'PRAGMA table_info(swings)'
-            last_swing = db.get_last_swing()
+            if app.db_type == 'postgres':
+                last_swing, column_names = db.get_last_swing()
+            else:
+                last_swing = db.get_last_swing()
             if last_swing:
                 if app.db_type == 'sqlite':
                     # Dynamically construct the JSON response
@@ -37,7 +40,10 @@ def create_app(db,db_type):
         payload = ''
         code = 204
         pragma = 'PRAGMA table_info(swings)'
-        swings = db.get_swings_by_club(club)
+        if app.db_type == 'postgres':
+            swings, column_names = db.get_swings_by_club(club)
+        else:
+            swings = db.get_swings_by_club(club)
         if swings:
             # Dynamically construct the JSON response
             if app.db_type == 'sqlite':
@@ -53,4 +59,42 @@ def create_app(db,db_type):
             payload = jsonify(results)
             code = 200
         return payload, code
+
+    @app.route('/sessions', methods=['GET'])
+    def get_sessions():
+        """ Get the most recent sessions from the database """
+        try:
+            payload = ''
+            code = 204
+            sessions, column_names = db.get_sessions()
+            if sessions:
+                results = [
+                    {column_names[i]: session[i] for i in range(len(column_names))}
+                        for session in sessions
+                ]
+                payload = jsonify(results)
+                code = 200
+            return payload, code
+        except Exception as e:
+            app.logger.error(f"Error in get_sessions: {str(e)}")
+            return jsonify({"error": str(e)}), 500
+
+    @app.route('/sessions/<int:session_id>/swings', methods=['GET'])
+    def get_swings_by_session(session_id):
+        """ Get all swings for a given session from the database """
+        try:
+            payload = ''
+            code = 204
+            swings, column_names = db.get_swings_by_session(session_id)
+            if swings:
+                results = [
+                    {column_names[i]: swing[i] for i in range(len(column_names))}
+                        for swing in swings
+                ]
+                payload = jsonify(results)
+                code = 200
+            return payload, code
+        except Exception as e:
+            app.logger.error(f"Error in get_swings_by_session: {str(e)}")
+            return jsonify({"error": str(e)}), 500
     return app
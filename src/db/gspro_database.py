@@ -15,6 +15,10 @@ class GSProDatabaseHandler:
         self.last_shot_id = 0
         self.last_round_id = 0
         self.target_db = target_db
+        # Parsed PlayerBag per user guid as (raw Clubs JSON, clubs, club lookup)
+        self.bag_cache = {}
+        # Kept open between polls so checking the bag doesn't reconnect for every batch
+        self.bag_conn = None
         
         # Try to get the last processed shot ID from the target database
         if target_db:
@@ -107,28 +111,76 @@ class GSProDatabaseHandler:
             logging.error(f"Error getting new rounds: {e}")
             return []
     
-    def get_player_clubs(self, user_guid=None):
-        """ Get player club configuration """
+    def _get_bag_json(self, user_guid=None):
+        """ Get the raw Clubs JSON for the player's bag """
+        if self.bag_conn is None:
+            self.bag_conn = sqlite3.connect(self.db_path)
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
+            cursor = self.bag_conn.cursor()
             if user_guid:
-                cursor.execute("SELECT Clubs FROM PlayerBag WHERE UserGuid = ?", (user_guid,))
+                cursor.execute("SELECT Clubs FROM PlayerBag WHERE UserGuid = ? LIMIT 1", (user_guid,))
             else:
                 cursor.execute("SELECT Clubs FROM PlayerBag LIMIT 1")
-            
-            result = cursor.fetchone()
-            conn.close()
-            
-            if result and result[0]:
-                return json.loads(result[0])
-            return None
-            
+            # Read every row so the statement doesn't keep a lock on GSPro's database
+            result = cursor.fetchall()
+        except sqlite3.Error:
+            # Reconnect on the next check, e.g. if GSPro replaced the database file
+            self.bag_conn.close()
+            self.bag_conn = None
+            raise
+        return result[0][0] if result else None
+
+    def _get_cached_bag(self, user_guid=None):
+        """ Get the cached bag entry, re-parsing only when the PlayerBag row changed """
+        raw_clubs = self._get_bag_json(user_guid)
+        cached = self.bag_cache.get(user_guid)
+        if cached is None or cached[0] != raw_clubs:
+            clubs = json.loads(raw_clubs) if raw_clubs else None
+            cached = (raw_clubs, clubs, self._build_club_lookup(clubs))
+            self.bag_cache[user_guid] = cached
+            logging.info("Loaded player bag with %s clubs", len(clubs or []))
+        return cached
+
+    @staticmethod
+    def _build_club_lookup(clubs):
+        """ Build a lookup of club code to (ClubIndex, ClubName, Loft) from the bag's Clubs list """
+        lookup = {}
+        skipped = 0
+        for entry in clubs or []:
+            if not isinstance(entry, dict) or entry.get('ClubIndex') is None or not entry.get('Club'):
+                skipped += 1
+                continue
+            lookup[str(entry['Club']).upper()] = (entry['ClubIndex'], entry.get('ClubName'), entry.get('Loft'))
+        if skipped:
+            logging.warning("Skipped %s PlayerBag entries without ClubIndex and Club", skipped)
+        return lookup
+
+    def get_player_clubs(self, user_guid=None):
+        """ Get player club configuration """
+        try:
+            return self._get_cached_bag(user_guid)[1]
         except Exception as e:
             logging.error(f"Error getting player clubs: {e}")
             return None
-    
+
+    def get_club_lookup(self, user_guid=None):
+        """ Get the club lookup for the player's bag """
+        try:
+            return self._get_cached_bag(user_guid)[2]
+        except Exception as e:
+            logging.error(f"Error getting club lookup: {e}")
+            return {}
+
+    @staticmethod
+    def enrich_shot(shot_data, club_lookup):
+        """ Add the bag's club index, name and loft to the shot data """
+        gspro_data = shot_data['GSProData']
+        club = gspro_data.get('Club')
+        entry = club_lookup.get(str(club).upper()) if club else None
+        if entry:
+            gspro_data['ClubIndex'], gspro_data['ClubName'], gspro_data['BagLoft'] = entry
+        return shot_data
+
     def process_shot_data(self, shot_data_str):
         """ Process and parse shot data """
         if not shot_data_str:
@@ -142,7 +194,6 @@ class GSProDatabaseHandler:
             transformed_data = {
                 'DeviceID': 'GSPro',
                 'Units': 'Yards',
-                'ShotNumber': gspro_data.get('club', 'Unknown'),  # Use club as identifier
                 'APIversion': '1',
                 'BallData': {
                     'Speed': gspro_data.get('BallSpeed', 0),
@@ -201,12 +252,15 @@ class GSProDatabaseHandler:
         try:
             # Check for new shots
             raw_shots = self.get_new_shots()
+            # The bag is checked once per batch and only re-parsed when it changed
+            club_lookup = self.get_club_lookup() if raw_shots else {}
             for shot in raw_shots:
                 shot_id, date_created, shot_data_str = shot
                 processed_data = self.process_shot_data(shot_data_str)
                 if processed_data:
                     processed_data['gspro_shot_id'] = shot_id
                     processed_data['gspro_date_created'] = date_created
+                    self.enrich_shot(processed_data, club_lookup)
                     new_shots.append(processed_data)
             
             # Check for new rounds
@@ -0,0 +1,38 @@
+""" Session tracking for grouping shots into practice sessions """
+import logging
+from datetime import datetime, timedelta
+
+def parse_shot_time(value):
+    """ Parse a GSPro shot timestamp, returning None if it can't be parsed """
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    try:
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value)
+        if value:
+            return datetime.fromisoformat(str(value)).replace(tzinfo=None)
+    except (OverflowError, OSError, ValueError):
+        pass
+    logging.warning("Could not parse shot timestamp: %r", value)
+    return None
+
+class SessionTracker:
+    """ Class to track the current session as shots arrive """
+    def __init__(self, gap_minutes=30):
+        self.gap = timedelta(minutes=gap_minutes)
+        self.session_id = None
+        self.last_shot_time = None
+
+    def starts_new_session(self, shot_time):
+        """ Check if a shot at the given time opens a new session """
+        if self.session_id is None or self.last_shot_time is None:
+            return True
+        return shot_time - self.last_shot_time > self.gap
+
+    def advance(self, session_id, shot_time):
+        """ Record that a shot at the given time was added to the session """
+        if session_id != self.session_id or self.last_shot_time is None:
+            self.last_shot_time = shot_time
+        else:
+            self.last_shot_time = max(self.last_shot_time, shot_time)
+        self.session_id = session_id
@@ -1,5 +1,11 @@
 """ Database module for PostgreSQL operations """
+import logging
+import threading
 import psycopg2
+try:
+    from .session_tracker import SessionTracker, parse_shot_time
+except ImportError:
+    from db.session_tracker import SessionTracker, parse_shot_time
 
 class ShotDatabase:
     """ Class to handle database operations """
@@ -14,22 +20,148 @@ class ShotDatabase:
         )
         self.table = settings['postgres']['table']
         self.cursor = self.connection.cursor()
+        self.track_sessions = settings.get('track_sessions', True)
+        self.sessions = SessionTracker(settings.get('session_gap_minutes', 30))
+        # Shots replayed from before sessions were tracked get their own tracker,
+        # so backfilling old history never moves the live session
+        self.backfill_sessions = SessionTracker(settings.get('session_gap_minutes', 30))
+        # The API shares one cursor across request threads
+        self.lock = threading.Lock()
+
+    def create_session_tables(self):
+        """ Create the sessions table and shot enrichment columns if missing """
+        try:
+            self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id SERIAL PRIMARY KEY,
+                started_at TIMESTAMP NOT NULL,
+                ended_at TIMESTAMP NOT NULL,
+                shot_count INT NOT NULL DEFAULT 0,
+                first_shot_id INT,
+                last_shot_id INT
+            )
+            """)
+            self.cursor.execute("""
+            ALTER TABLE {}
+                ADD COLUMN IF NOT EXISTS session_id INT,
+                ADD COLUMN IF NOT EXISTS shot_time TIMESTAMP,
+                ADD COLUMN IF NOT EXISTS club_index INT,
+                ADD COLUMN IF NOT EXISTS club_name VARCHAR(32),
+                ADD COLUMN IF NOT EXISTS bag_loft FLOAT
+            """.format(self.table))
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS {0}_session_id_idx ON {0} (session_id)"
+                                .format(self.table))
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS {0}_club_idx ON {0} (UPPER(club))"
+                                .format(self.table))
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            raise e
+
+        # Resume the most recent session so a restart mid-practice keeps adding to it
+        self.cursor.execute("SELECT session_id, ended_at FROM sessions ORDER BY ended_at DESC LIMIT 1")
+        last_session = self.cursor.fetchone()
+        if last_session:
+            self.sessions.advance(last_session[0], last_session[1])
+
+    def _session_cte(self, tracker, shot_time, gspro_shot_id):
+        """ Build the CTE that adds the shot to the tracker's session, or opens a new one """
+        if tracker.starts_new_session(shot_time):
+            return """
+            WITH session AS (
+                INSERT INTO sessions (started_at, ended_at, shot_count, first_shot_id, last_shot_id)
+                VALUES (%s, %s, 1, %s, %s) RETURNING session_id
+            )
+            """, (shot_time, shot_time, gspro_shot_id, gspro_shot_id)
+
+        return """
+        WITH session AS (
+            UPDATE sessions
+            SET started_at = LEAST(started_at, %s), ended_at = GREATEST(ended_at, %s),
+                shot_count = shot_count + 1,
+                first_shot_id = LEAST(first_shot_id, %s), last_shot_id = GREATEST(last_shot_id, %s)
+            WHERE session_id = %s RETURNING session_id
+        )
+        """, (shot_time, shot_time, gspro_shot_id, gspro_shot_id, tracker.session_id)
+
+    def _execute_with_session(self, query, params, tracker, shot_time):
+        """ Run a statement returning the session id, then move the session forward """
+        try:
+            self.cursor.execute(query, params)
+            session_id = self.cursor.fetchone()[0]
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            raise e
+        # Only move the session forward once the shot is safely stored
+        if session_id is not None:
+            tracker.advance(session_id, shot_time)
+
+    def _join_overlapping_session(self, tracker, shot_time):
+        """ Point the tracker at a stored session within the gap of the shot, if there is one """
+        try:
+            self.cursor.execute("""
+            SELECT session_id FROM sessions
+            WHERE started_at - %s <= %s AND ended_at + %s >= %s
+            ORDER BY ended_at DESC LIMIT 1
+            """, (tracker.gap, shot_time, tracker.gap, shot_time))
+            session = self.cursor.fetchone()
+        except Exception as e:
+            self.connection.rollback()
+            raise e
+        if session:
+            tracker.advance(session[0], shot_time)
+
+    def _backfill_shot(self, gspro_shot_id, shot_time, gspro_data):
+        """ Fill in the session and club of a shot stored before sessions were tracked """
+        tracker = self.backfill_sessions
+        session_time = shot_time or tracker.last_shot_time
+        if session_time is None:
+            return
+        if tracker.starts_new_session(session_time):
+            self._join_overlapping_session(tracker, session_time)
+        cte, cte_params = self._session_cte(tracker, session_time, gspro_shot_id)
+        query = cte + """
+        UPDATE {}
+        SET session_id = (SELECT session_id FROM session), shot_time = %s,
+            club_index = %s, club_name = %s, bag_loft = %s
+        WHERE gspro_shot_id = %s RETURNING session_id
+        """.format(self.table)
+        values = (
+            shot_time,
+            gspro_data.get('ClubIndex'),
+            gspro_data.get('ClubName'),
+            gspro_data.get('BagLoft'),
+            gspro_shot_id
+        )
+        self._execute_with_session(query, cte_params + values, tracker, session_time)
+        logging.debug("Backfilled session for gspro_shot_id: %s", gspro_shot_id)
 
     def insert_shot(self, shot_data):
         """Insert shot data from JSON into database"""
-        
+        gspro_data = shot_data.get('GSProData', {})
+        shot_time = parse_shot_time(shot_data.get('gspro_date_created'))
+
         # Check if this shot already exists by gspro_shot_id
         gspro_shot_id = shot_data.get('gspro_shot_id')
         if gspro_shot_id:
-            check_query = "SELECT 1 FROM {} WHERE gspro_shot_id = %s LIMIT 1".format(self.table)
+            check_query = "SELECT session_id FROM {} WHERE gspro_shot_id = %s LIMIT 1".format(self.table)
             self.cursor.execute(check_query, (gspro_shot_id,))
-            if self.cursor.fetchone():
+            existing = self.cursor.fetchone()
+            if existing:
                 # Shot already exists, skip insert
-                import logging
+                if existing[0] is None and self.track_sessions:
+                    self._backfill_shot(gspro_shot_id, shot_time, gspro_data)
                 logging.debug(f"Skipping duplicate shot with gspro_shot_id: {gspro_shot_id}")
                 return False
-        
-        query = """
+
+        # Without a usable timestamp the shot joins the session of the previous one,
+        # but only the real timestamp is stored with the shot
+        session_time = shot_time or self.sessions.last_shot_time
+        track_session = self.track_sessions and session_time is not None
+        cte, cte_params = (self._session_cte(self.sessions, session_time, gspro_shot_id)
+                           if track_session else ('', ()))
+        query = cte + """
         INSERT INTO {} (
             gspro_shot_id, club, device_id, units, api_version,
             ball_speed, spin_axis, total_spin, hla, vla, backspin, sidespin, carry_distance,
@@ -38,23 +170,24 @@ class ShotDatabase:
             speed_at_impact, vertical_face_impact, horizontal_face_impact, closure_rate,
             contains_ball_data, contains_club_data, launch_monitor_ready, 
             launch_monitor_ball_detected, is_heartbeat,
-            total_distance, distance_to_pin, face_to_path, smash_factor, dynamic_loft
+            total_distance, distance_to_pin, face_to_path, smash_factor, dynamic_loft,
+            shot_time, club_index, club_name, bag_loft, session_id
         ) VALUES (
             %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
             %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
             %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-            %s, %s, %s, %s, %s, %s
-        )
-        """.format(self.table)
+            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+            {}
+        ) RETURNING session_id
+        """.format(self.table, '(SELECT session_id FROM session)' if track_session else 'NULL')
 
         ball_data = shot_data.get('BallData', {})
         club_data = shot_data.get('ClubData', {})
         shot_options = shot_data.get('ShotDataOptions', {})
-        gspro_data = shot_data.get('GSProData', {})
 
         values = (
             shot_data.get('gspro_shot_id'),
-            shot_data.get('ShotNumber'),
+            gspro_data.get('Club'),
             shot_data.get('DeviceID'),
             shot_data.get('Units'),
             shot_data.get('APIversion'),
@@ -88,30 +221,55 @@ class ShotDatabase:
             gspro_data.get('DistanceToPin'),
             gspro_data.get('FaceToPath'),
             gspro_data.get('SmashFactor'),
-            gspro_data.get('DynamicLoft')
+            gspro_data.get('DynamicLoft'),
+            shot_time,
+            gspro_data.get('ClubIndex'),
+            gspro_data.get('ClubName'),
+            gspro_data.get('BagLoft')
         )
 
-        try:
-            self.cursor.execute(query, values)
-            self.connection.commit()
-            return True
-        except Exception as e:
-            self.connection.rollback()
-            raise e
+        self._execute_with_session(query, cte_params + values, self.sessions, session_time)
+        return True
 
     def get_cursor(self):
         """Return the cursor"""
         return self.cursor
 
+    def _fetch(self, query, params=None, fetch_one=False):
+        """Run a read query and return the result with its column names"""
+        with self.lock:
+            try:
+                self.cursor.execute(query, params)
+                result = self.cursor.fetchone() if fetch_one else self.cursor.fetchall()
+                column_names = [desc[0] for desc in self.cursor.description]
+                return result, column_names
+            except Exception as e:
+                # Roll back so the connection stays usable for the next request
+                self.connection.rollback()
+                raise e
+
     def get_last_swing(self):
-        """Get the last swing from the database"""
+        """Get the last swing and its column names from the database"""
         query = "SELECT * FROM {} ORDER BY gspro_shot_id DESC LIMIT 1".format(self.table)
-        self.cursor.execute(query)
-        return self.cursor.fetchone()
-
-    def get_swings_by_club(self, club_index, limit=25):
-        """Get all shots for a specific club by club_index"""
-        query = "SELECT * FROM {} WHERE club_index = %s LIMIT %s".format(self.table)
-        self.cursor.execute(query, (club_index, limit))
-        results = self.cursor.fetchall()
-        return results
+        return self._fetch(query, fetch_one=True)
+
+    def get_swings_by_club(self, club, limit=25):
+        """Get the most recent shots and their column names for a club code (I7)"""
+        query = """
+        SELECT * FROM {} WHERE UPPER(club) = UPPER(%s)
+        ORDER BY gspro_shot_id DESC LIMIT %s
+        """.format(self.table)
+        return self._fetch(query, (club, limit))
+
+    def get_sessions(self, limit=50):
+        """Get the most recent sessions and their column names"""
+        query = """
+        SELECT session_id, started_at, ended_at, shot_count, first_shot_id, last_shot_id
+        FROM sessions ORDER BY started_at DESC LIMIT %s
+        """
+        return self._fetch(query, (limit,))
+
+    def get_swings_by_session(self, session_id):
+        """Get all shots recorded in a session and their column names"""
+        query = "SELECT * FROM {} WHERE session_id = %s ORDER BY gspro_shot_id".format(self.table)
+        return self._fetch(query, (session_id,))
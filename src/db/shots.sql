@@ -5,6 +5,10 @@ CREATE TABLE shots (
     player_name VARCHAR(100),
     shot_number INT,
     club_index INT,
+    club_name VARCHAR(32),
+    bag_loft FLOAT,
+    session_id INT,
+    shot_time TIMESTAMP,
     distance_to_pin FLOAT,
     total_distance FLOAT,
     
@@ -40,4 +44,16 @@ CREATE TABLE shots (
 CREATE TABLE clubs (
     club_index INT PRIMARY KEY,
     club_name VARCHAR(8)
-);
\ No newline at end of file
+);
+
+CREATE TABLE sessions (
+    session_id SERIAL PRIMARY KEY,
+    started_at TIMESTAMP NOT NULL,
+    ended_at TIMESTAMP NOT NULL,
+    shot_count INT NOT NULL DEFAULT 0,
+    first_shot_id INT,
+    last_shot_id INT
+);
+
+CREATE INDEX shots_session_id_idx ON shots (session_id);
+CREATE INDEX shots_club_index_idx ON shots (club_index);
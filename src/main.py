@@ -33,7 +33,8 @@ class GSProDatabasePollingHandler():
             new_shots, new_rounds = self.gspro_db.check_for_new_data()
             
             for shot_data in new_shots:
-                logging.info("New shot from GSPro database: Shot %s", shot_data.get('ShotNumber'))
+                logging.info("New shot from GSPro database: Shot %s (%s)", shot_data.get('gspro_shot_id'),
+                             shot_data['GSProData'].get('Club'))
                 self.queue.put(shot_data)
                 
             if new_rounds:
@@ -87,6 +88,7 @@ def main(config):
             
         # Connect to PostgreSQL
         db = ShotDatabase(config)
+        db.create_session_tables()
         queue = Queue()
         lock = threading.Lock()
 
@@ -0,0 +1,5 @@
+""" Make the src modules importable the same way main.py imports them """
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
@@ -0,0 +1,28 @@
+""" Tests for the PlayerBag club lookup """
+from db.gspro_database import GSProDatabaseHandler
+
+def test_lookup_by_club_code():
+    lookup = GSProDatabaseHandler._build_club_lookup([
+        {'ClubIndex': 0, 'Club': 'DR', 'ClubName': 'Driver', 'Loft': 10.5},
+        {'ClubIndex': 6, 'Club': 'i7', 'ClubName': '7 Iron', 'Loft': 34},
+    ])
+    assert lookup == {'DR': (0, 'Driver', 10.5), 'I7': (6, '7 Iron', 34)}
+
+def test_entries_without_index_or_code_are_skipped(caplog):
+    lookup = GSProDatabaseHandler._build_club_lookup([
+        {'Club': 'PW', 'ClubName': 'Pitching Wedge'},
+        {'ClubIndex': 3, 'ClubName': 'No Code'},
+        'not a club',
+        {'ClubIndex': 9, 'Club': 'SW'},
+    ])
+    assert lookup == {'SW': (9, None, None)}
+    assert caplog.text.count('Skipped 3 PlayerBag entries') == 1
+
+def test_empty_bag():
+    assert GSProDatabaseHandler._build_club_lookup(None) == {}
+    assert GSProDatabaseHandler._build_club_lookup([]) == {}
+
+def test_enrich_shot_matches_code_case_insensitively():
+    shot = {'GSProData': {'Club': 'i7'}}
+    GSProDatabaseHandler.enrich_shot(shot, {'I7': (6, '7 Iron', 34)})
+    assert shot['GSProData'] == {'Club': 'i7', 'ClubIndex': 6, 'ClubName': '7 Iron', 'BagLoft': 34}
@@ -0,0 +1,47 @@
+""" Tests for session tracking """
+from datetime import datetime, timedelta
+
+from db.session_tracker import SessionTracker, parse_shot_time
+
+START = datetime(2025, 1, 17, 17, 0)
+
+def test_parse_shot_time_formats():
+    assert parse_shot_time('2025-01-17 17:07:00.1234567') == datetime(2025, 1, 17, 17, 7, 0, 123456)
+    assert parse_shot_time('2025-01-17T17:07:00+00:00') == datetime(2025, 1, 17, 17, 7)
+    assert parse_shot_time(START) == START
+
+def test_parse_shot_time_unparseable_returns_none(caplog):
+    assert parse_shot_time('not a date') is None
+    assert parse_shot_time(None) is None
+    # .NET ticks are out of range for fromtimestamp
+    assert parse_shot_time(638726220000000000) is None
+    assert 'Could not parse shot timestamp' in caplog.text
+
+def test_first_shot_starts_session():
+    tracker = SessionTracker(gap_minutes=30)
+    assert tracker.starts_new_session(START)
+
+def test_shots_within_gap_stay_in_session():
+    tracker = SessionTracker(gap_minutes=30)
+    tracker.advance(1, START)
+    assert not tracker.starts_new_session(START + timedelta(minutes=30))
+    tracker.advance(1, START + timedelta(minutes=30))
+    assert not tracker.starts_new_session(START + timedelta(minutes=59))
+
+def test_gap_starts_new_session():
+    tracker = SessionTracker(gap_minutes=30)
+    tracker.advance(1, START)
+    assert tracker.starts_new_session(START + timedelta(minutes=31))
+
+def test_advance_keeps_latest_time_within_session():
+    tracker = SessionTracker(gap_minutes=30)
+    tracker.advance(1, START + timedelta(minutes=10))
+    tracker.advance(1, START)
+    assert tracker.last_shot_time == START + timedelta(minutes=10)
+
+def test_advance_to_new_session_resets_time():
+    tracker = SessionTracker(gap_minutes=30)
+    tracker.advance(1, START + timedelta(hours=2))
+    tracker.advance(2, START)
+    assert tracker.session_id == 2
+    assert tracker.last_shot_time == START